@@ -0,0 +1,45 @@
+import sys
+import tempfile
+import os
+import numpy as np
+from scipy.io.wavfile import write
+
+from scorer import PronunciationScorer
+
+# Manual check (loads two models): python check_shared_weights.py [recording.wav]
+
+
+def check_shared_weights(wav_path=None, model_size="tiny.en"):
+    tmp_wav = None
+    # Without a recording, use 2 seconds of a quiet tone: it only has to run the full pipeline
+    if not wav_path:
+        t = np.arange(2 * 16000) / 16000.0
+        fd, tmp_wav = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        write(tmp_wav, 16000, (3000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16))
+        wav_path = tmp_wav
+
+    try:
+        print("Scoring with a private model...")
+        private = PronunciationScorer(model_size=model_size)
+        expected = private.score(wav_path, "hello")
+        private.close()
+
+        print("Scoring with shared weights...")
+        shared = PronunciationScorer(model_size=model_size, shared=True)
+        try:
+            result = shared.score(wav_path, "hello")
+        finally:
+            shared.close()
+    finally:
+        if tmp_wav:
+            os.remove(tmp_wav)
+
+    print(f"Private: {expected}  Shared: {result}")
+    assert not result[1].startswith("Error:"), f"Shared model failed to transcribe: {result[1]}"
+    assert result == expected, "Shared model output differs from the private model"
+    print("Shared weights OK.")
+
+
+if __name__ == "__main__":
+    check_shared_weights(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
 import csv
-import random
 import threading
 import os
 import sys
@@ -42,6 +41,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from audio_recorder import AudioRecorder
 from scorer import PronunciationScorer
+from learner_store import LearnerStore
+from scheduler import SessionScheduler
 
 
 class Application(tk.Tk):
@@ -53,7 +54,12 @@ class Application(tk.Tk):
         # Data
         self.levels = ["A1", "A2", "B1", "B2", "C1", "C2"]
         self.words_data = self.load_words()
-        self.unlocked_level_index = 0
+
+        # Progress (attempts, word schedule, unlocked level) survives restarts
+        db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "learner.db")
+        self.store = LearnerStore(db_path)
+        self.scheduler = SessionScheduler(self.words_data, self.store.load_word_stats())
+        self.unlocked_level_index = int(self.store.get_setting("unlocked_level_index", 0))
         
         # Session state
         self.current_level = None
@@ -91,10 +97,20 @@ class Application(tk.Tk):
         self.container.pack(fill="both", expand=True, padx=20, pady=20)
 
         self.show_loading_screen()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Start loading model in background
         self.load_model_thread()
 
+    def on_close(self):
+        self.recorder.stop_recording()
+        self.store.close()
+        # Tear the window down first: scorer.close() waits for a running warm-up/transcription
+        # and would otherwise leave a frozen window on screen meanwhile.
+        self.destroy()
+        if self.scorer:
+            self.scorer.close()
+
     def change_device(self, selection):
         # Find index
         idx = None
@@ -136,7 +152,17 @@ class Application(tk.Tk):
         def _load():
             try:
                 # Switch to "tiny" for speed on CPU
-                self.scorer = PronunciationScorer(model_size="tiny.en")
+                # PRONUNCIATION_SHARED_WEIGHTS=1 shares one copy of the weights between app instances
+                shared = os.environ.get("PRONUNCIATION_SHARED_WEIGHTS", "").lower() in ("1", "true", "yes")
+                if shared:
+                    try:
+                        self.scorer = PronunciationScorer(model_size="tiny.en", shared=True)
+                    except Exception as e:
+                        # e.g. torch too old for mmap loading: a private copy still works
+                        print(f"Shared weights unavailable ({e}), loading a private copy.")
+                        self.scorer = PronunciationScorer(model_size="tiny.en")
+                else:
+                    self.scorer = PronunciationScorer(model_size="tiny.en")
                 self.after(0, self.on_model_loaded)
             except Exception as e:
                 print(f"Error loading model: {e}")
@@ -148,6 +174,8 @@ class Application(tk.Tk):
     def on_model_loaded(self):
         self.model_loading = False
         self.show_level_selection()
+        # Warm the model up while the user is picking a level, so the first attempt isn't slow
+        threading.Thread(target=self.scorer.warm_up, daemon=True).start()
 
     def show_loading_screen(self):
         for widget in self.container.winfo_children():
@@ -159,6 +187,9 @@ class Application(tk.Tk):
     def show_level_selection(self):
         # Stop listening if we were
         self.recorder.stop_recording()
+        # Pick up levels unlocked from another app window sharing the same store
+        self.unlocked_level_index = max(self.unlocked_level_index,
+                                        int(self.store.get_setting("unlocked_level_index", 0)))
 
         for widget in self.container.winfo_children():
             widget.destroy()
@@ -178,12 +209,8 @@ class Application(tk.Tk):
 
     def start_level(self, level):
         self.current_level = level
-        # Pick 10 random words
-        all_words = self.words_data.get(level, [])
-        if len(all_words) < 10:
-            self.session_words = all_words # Fallback if not enough words
-        else:
-            self.session_words = random.sample(all_words, 10)
+        # Pick 10 words: overdue/weak ones first, then new ones
+        self.session_words = self.scheduler.next_session(level, 10)
             
         self.current_word_index = 0
         self.total_score = 0
@@ -339,6 +366,9 @@ class Application(tk.Tk):
             # We keep the BEST result for this word.
             
             improved = False
+            self.store.add_attempt(self.session_words[self.current_word_index], self.current_level,
+                                   score, transcription)
+
             if score > self.current_word_best:
                 self.current_word_best = score
                 improved = True
@@ -372,8 +402,10 @@ class Application(tk.Tk):
         if self.current_word_best >= 7:
              pass # Passing grade
 
+        word = self.session_words[self.current_word_index]
         self.total_score += self.current_word_best
-        self.results.append((self.session_words[self.current_word_index], self.current_word_best, "Best Result"))
+        self.results.append((word, self.current_word_best, "Best Result"))
+        self.store.save_word_stats(self.scheduler.review(word, self.current_level, self.current_word_best))
         
         self.recorder.stop_recording() # Stop briefly while switching screens
         
@@ -386,6 +418,7 @@ class Application(tk.Tk):
             
         # Stop everything
         self.recorder.stop_recording()
+        self.store.flush()
             
         avg_score = self.total_score / len(self.session_words) if self.session_words else 0
         success = avg_score >= 7.0 # 7 out of 10
@@ -403,6 +436,7 @@ class Application(tk.Tk):
             if current_idx < len(self.levels) - 1:
                 if self.unlocked_level_index <= current_idx:
                     self.unlocked_level_index = current_idx + 1
+                    self.store.raise_setting("unlocked_level_index", self.unlocked_level_index)
         else:
             tk.Label(self.container, text="Need 7.0+ average to unlock next level.", font=("Helvetica", 12)).pack(pady=5)
 
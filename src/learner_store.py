@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+
+
+class LearnerStore:
+    """
+    Persists the learner's progress in SQLite (WAL mode).
+
+    Every scored attempt goes into the `attempts` table, and the per-word scheduling state
+    (one row per word) goes into `word_stats`. Startup only reads `word_stats`, so it
+    stays fast however long the attempt history gets. Writes are queued and sent in one
+    transaction once `batch_size` of them are pending, or when flush()/close() is called.
+
+    Several app windows may share the file. A `word_stats` row is only overwritten by a
+    newer review (larger `last_ts`), and raise_setting() never lowers a stored number,
+    so a window holding older state can't roll back another window's progress.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS attempts (
+            id INTEGER PRIMARY KEY,
+            word TEXT NOT NULL,
+            level TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            transcription TEXT,
+            ts REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_attempts_word_ts ON attempts (word, ts);
+
+        CREATE TABLE IF NOT EXISTS word_stats (
+            word TEXT PRIMARY KEY,
+            level TEXT NOT NULL,
+            best_score INTEGER NOT NULL,
+            last_score INTEGER NOT NULL,
+            reviews INTEGER NOT NULL,
+            streak INTEGER NOT NULL,
+            ease REAL NOT NULL,
+            interval REAL NOT NULL,
+            due REAL NOT NULL,
+            last_ts REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_word_stats_level_due ON word_stats (level, due);
+
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    WORD_STATS_COLUMNS = ("word", "level", "best_score", "last_score", "reviews",
+                          "streak", "ease", "interval", "due", "last_ts")
+
+    def __init__(self, path, batch_size=20):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending_attempts = []
+        self._pending_stats = {}
+        self._lock = threading.Lock()
+
+        # Several app windows may share the same file, so wait on locks instead of failing
+        self.conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+    def load_word_stats(self):
+        """Returns {word: dict} with the saved scheduling state of every practised word."""
+        cur = self.conn.execute(f"SELECT {', '.join(self.WORD_STATS_COLUMNS)} FROM word_stats")
+        return {row[0]: dict(zip(self.WORD_STATS_COLUMNS, row)) for row in cur}
+
+    def add_attempt(self, word, level, score, transcription, ts=None):
+        with self._lock:
+            self._pending_attempts.append((word, level, score, transcription, ts or time.time()))
+            self._maybe_flush()
+
+    def save_word_stats(self, stats):
+        """Queues the scheduling state of one word (a dict with WORD_STATS_COLUMNS keys)."""
+        with self._lock:
+            self._pending_stats[stats["word"]] = tuple(stats[c] for c in self.WORD_STATS_COLUMNS)
+            self._maybe_flush()
+
+    def get_setting(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def raise_setting(self, key, value):
+        """Stores an integer setting, keeping the larger value if another window stored one already."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO settings (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))",
+                (key, int(value)))
+            self.conn.commit()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def _maybe_flush(self):
+        if len(self._pending_attempts) + len(self._pending_stats) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending_attempts and not self._pending_stats:
+            return
+        placeholders = ", ".join("?" for _ in self.WORD_STATS_COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in self.WORD_STATS_COLUMNS[1:])
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO attempts (word, level, score, transcription, ts) VALUES (?, ?, ?, ?, ?)",
+                self._pending_attempts)
+            self.conn.executemany(
+                f"INSERT INTO word_stats ({', '.join(self.WORD_STATS_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(word) DO UPDATE SET {updates} WHERE excluded.last_ts > word_stats.last_ts",
+                list(self._pending_stats.values()))
+        self._pending_attempts = []
+        self._pending_stats = {}
@@ -0,0 +1,133 @@
+import heapq
+import math
+import random
+import time
+
+
+class SessionScheduler:
+    """
+    Spaced-repetition picker for practice sessions.
+
+    Each level keeps two heaps:
+      - `_due`: practised words keyed by their due time, pulled earlier the weaker the last score
+      - `_new`: words never practised, in a random but fixed order
+    Stale heap entries (a word re-reviewed since it was pushed) are skipped lazily, so
+    picking a session of k words costs O(k log n) instead of scanning every word.
+    A headword listed at several CEFR levels shares one schedule across all of them.
+    """
+
+    PASS_SCORE = 7                # same threshold the GUI uses for a "good" attempt
+    RETRY_INTERVAL = 10 * 60      # failed words come back after 10 minutes
+    FIRST_INTERVAL = 24 * 3600    # first successful review -> see it again tomorrow
+    WEAKNESS_SECONDS = 3600       # each missing point moves a word 1 hour earlier in the queue...
+    MIN_GAP = RETRY_INTERVAL      # ...but never closer than this to its last review
+    NEW_WORD_SHARE = 0.3          # part of each session kept for new words while any are left
+    MIN_EASE = 1.3
+
+    def __init__(self, words_data, saved_stats=None):
+        self.stats = dict(saved_stats or {})
+        self._due = {}
+        self._new = {}
+        self._levels_of = {}
+
+        for level, words in words_data.items():
+            due, new = [], []
+            for word in dict.fromkeys(words):  # drop duplicate headwords, keep order
+                self._levels_of.setdefault(word, []).append(level)
+                s = self.stats.get(word)
+                if s:
+                    due.append((self._key(s), word))
+                else:
+                    new.append((random.random(), word))
+            heapq.heapify(due)
+            heapq.heapify(new)
+            self._due[level] = due
+            self._new[level] = new
+
+    def next_session(self, level, k=10, now=None):
+        """
+        Picks k words: overdue ones first, then new ones, then the ones due soonest.
+        A share of the session is kept for new words so a pile of weak words can't
+        crowd them out forever.
+        """
+        now = now or time.time()
+        due = self._due.get(level, [])
+        new = self._new.get(level, [])
+
+        reserved = math.ceil(k * self.NEW_WORD_SHARE) if new else 0
+        overdue = self._pop_current(due, k - reserved, until=now)
+        fresh = self._pop_new(new, k - len(overdue))
+        # Out of new words: give the reserved slots back to overdue ones, then to upcoming ones
+        overdue += self._pop_current(due, k - len(overdue) - len(fresh), until=now)
+        upcoming = self._pop_current(due, k - len(overdue) - len(fresh))
+
+        # Nothing is reviewed yet, so put every picked word back in its queue
+        for entry in overdue + upcoming:
+            heapq.heappush(due, entry)
+        for entry in fresh:
+            heapq.heappush(new, entry)
+
+        session = [w for _, w in overdue + fresh + upcoming]
+        random.shuffle(session)
+        return session
+
+    def _pop_current(self, heap, n, until=None):
+        """Pops up to n live entries (optionally only those keyed <= until), dropping stale ones."""
+        picked = []
+        while len(picked) < n and heap and (until is None or heap[0][0] <= until):
+            entry = heapq.heappop(heap)
+            if self._is_current(entry):
+                picked.append(entry)
+        return picked
+
+    def _pop_new(self, heap, n):
+        picked = []
+        while len(picked) < n and heap:
+            entry = heapq.heappop(heap)
+            if entry[1] not in self.stats:
+                picked.append(entry)
+        return picked
+
+    def review(self, word, level, score, now=None):
+        """Updates the word's schedule from its best score this session and returns the new stats."""
+        now = now or time.time()
+        s = self.stats.get(word) or {
+            "word": word, "level": level, "best_score": 0, "last_score": 0,
+            "reviews": 0, "streak": 0, "ease": 2.5, "interval": 0.0, "due": now, "last_ts": now,
+        }
+        s = dict(s)
+
+        # SM-2 style: passing grows the interval by the ease factor, failing starts over
+        if score >= self.PASS_SCORE:
+            s["interval"] = self.FIRST_INTERVAL if s["streak"] == 0 else s["interval"] * s["ease"]
+            s["streak"] += 1
+        else:
+            s["interval"] = self.RETRY_INTERVAL
+            s["streak"] = 0
+        s["ease"] = max(self.MIN_EASE, s["ease"] + 0.1 * (score - 8))
+
+        s["reviews"] += 1
+        s["last_score"] = score
+        s["best_score"] = max(s["best_score"], score)
+        s["due"] = now + s["interval"]
+        s["last_ts"] = now
+        self.stats[word] = s
+
+        # Re-queue the word in every level that lists it, or it would drop out of the others
+        entry = (self._key(s), word)
+        for lvl in self._levels_of.get(word, [level]):
+            due = self._due.setdefault(lvl, [])
+            heapq.heappush(due, entry)
+            # Old entries for re-reviewed words pile up; rebuild once they dominate the heap
+            if len(due) > 2 * max(len(self.stats), 1) + 64:
+                self._due[lvl] = [e for e in due if self._is_current(e)]
+                heapq.heapify(self._due[lvl])
+        return s
+
+    def _key(self, s):
+        # Weak words come up earlier, but not before MIN_GAP has passed since their review
+        return max(s["due"] - (10 - s["last_score"]) * self.WEAKNESS_SECONDS, s["last_ts"] + self.MIN_GAP)
+
+    def _is_current(self, entry):
+        s = self.stats.get(entry[1])
+        return s is not None and self._key(s) == entry[0]
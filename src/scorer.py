@@ -1,17 +1,64 @@
 import whisper
 from rapidfuzz import fuzz
 import os
+import threading
+import time
 import numpy as np
 
+from shared_weights import SharedWhisperWeights
+
 
 class PronunciationScorer:
-    def __init__(self, model_size="medium.en"):
+    SAMPLE_RATE = 16000
+
+    def __init__(self, model_size="medium.en", shared=False):
         print(f"Loading Whisper model ({model_size})...")
-        # Ensure we are using CPU if CUDA is not available, or let torch decide (Whisper handles this usually)
-        # We can enforce cpu if needed: device="cpu"
-        self.model = whisper.load_model(model_size)
+        self.shared_weights = None
+        if shared:
+            # Map the weights from a region shared with other app instances / workers
+            # instead of keeping a private copy in this process (CPU only).
+            self.shared_weights = SharedWhisperWeights(model_size)
+            self.model = self.shared_weights.attach()
+        else:
+            # Ensure we are using CPU if CUDA is not available, or let torch decide (Whisper handles this usually)
+            # We can enforce cpu if needed: device="cpu"
+            self.model = whisper.load_model(model_size)
         print("Model loaded.")
 
+        # Serialises inference: whisper installs kv-cache hooks on the shared module while
+        # decoding, so two transcribe() calls at once would mix their caches. Also guards close().
+        self._lock = threading.Lock()
+        self.warmed_up = False
+
+    def warm_up(self):
+        """
+        Runs one dummy transcription so the first real attempt does not pay for lazy
+        torch kernel/allocator/thread-pool setup, and loads whisper's (cached) mel filterbank.
+        transcribe() pads every input to a 30s window, so a single length covers all takes.
+        """
+        with self._lock:
+            if self.warmed_up or self.model is None:
+                return
+
+            start = time.time()
+            whisper.audio.mel_filters(self.model.device, self.model.dims.n_mels)
+
+            # Quiet noise rather than pure silence so the decoder runs like on a real take.
+            # temperature=0.0 skips the fallback re-decodes noise would otherwise trigger.
+            noise = np.random.default_rng(0).normal(0.0, 0.01, 2 * self.SAMPLE_RATE).astype(np.float32)
+            self.model.transcribe(noise, fp16=False, temperature=0.0)
+
+            self.warmed_up = True
+            print(f"Model warmed up in {time.time() - start:.1f}s.")
+
+    def close(self):
+        """Releases the model. In shared mode this drops our reference to the shared weights."""
+        with self._lock:
+            self.model = None
+            if self.shared_weights:
+                self.shared_weights.release()
+                self.shared_weights = None
+
     def score(self, audio_path, target_word):
         """
         Transcribes the audio and compares it to the target word.
@@ -30,9 +77,14 @@ class PronunciationScorer:
             # Convert to float32 between -1 and 1 (Whisper expects this)
             # data is int16 from our recorder
             audio_np = data.astype(np.float32) / 32768.0
-            
-            # Transcribe using the numpy array instead of file path
-            result = self.model.transcribe(audio_np, fp16=False) # fp16=False for CPU
+
+            # A first attempt made during warm-up waits for it here
+            with self._lock:
+                if self.model is None:
+                    return 0, ""
+
+                # Transcribe using the numpy array instead of file path
+                result = self.model.transcribe(audio_np, fp16=False) # fp16=False for CPU
             text = result["text"].strip().lower()
             
             # Calculate score using "Best Match" logic
@@ -0,0 +1,254 @@
+import os
+import tempfile
+import time
+import atexit
+
+import numpy as np
+import torch
+import whisper
+from whisper.model import ModelDimensions, Whisper
+
+
+class SharedWhisperWeights:
+    """
+    Shares one copy of the Whisper weights between every process on the machine.
+
+    The first process loads the model normally and writes the checkpoint to a
+    file in the temp directory. Every process (the first one included) then
+    memory-maps that file, so the OS page cache backs the tensors and all
+    processes read the same physical pages. Each attached process drops a
+    small reference file next to the weights; the last one to release removes
+    the weights file again.
+
+    References and the lock record the owning pid, so entries left behind by a process
+    that was killed or crashed are cleaned up by the next process that takes the lock.
+
+    Requires torch >= 2.1 (torch.load(mmap=True) and load_state_dict(assign=True)).
+    The shared model always lives on the CPU.
+    """
+
+    MIN_TORCH = (2, 1)
+
+    def __init__(self, model_size, cache_dir=None):
+        torch_version = tuple(int(p) for p in torch.__version__.split("+")[0].split(".")[:2])
+        if torch_version < self.MIN_TORCH:
+            raise RuntimeError(f"Shared Whisper weights need torch >= 2.1, found {torch.__version__}")
+
+        self.model_size = model_size
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "pronunciation_app_weights")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        safe_name = model_size.replace(os.sep, "_").replace(":", "_")
+        self.weights_path = os.path.join(self.cache_dir, f"{safe_name}.pt")
+        self.refs_dir = os.path.join(self.cache_dir, f"{safe_name}.refs")
+        self.lock_path = os.path.join(self.cache_dir, f"{safe_name}.lock")
+        self.ref_path = os.path.join(self.refs_dir, f"{os.getpid()}-{id(self)}")
+        self.attached = False
+
+    def attach(self):
+        """Returns a Whisper model whose tensors are backed by the shared mapping."""
+        with self._lock():
+            os.makedirs(self.refs_dir, exist_ok=True)
+            self._prune_dead_refs()
+            if not os.path.exists(self.weights_path):
+                self._publish()
+            open(self.ref_path, "w").close()
+            self.attached = True
+
+        atexit.register(self.release)
+        try:
+            return self._map_model()
+        except Exception:
+            self.release()
+            raise
+
+    def release(self):
+        """Drops this process' reference and removes the weights if it was the last one."""
+        if not self.attached:
+            return
+        self.attached = False
+        atexit.unregister(self.release)
+
+        with self._lock():
+            try:
+                os.remove(self.ref_path)
+            except FileNotFoundError:
+                pass
+
+            self._prune_dead_refs()
+            if os.path.isdir(self.refs_dir) and not os.listdir(self.refs_dir):
+                try:
+                    os.remove(self.weights_path)
+                    os.rmdir(self.refs_dir)
+                except OSError as e:
+                    # Windows refuses to delete a file that is still mapped somewhere
+                    print(f"Shared weights not removed: {e}")
+
+    def _prune_dead_refs(self):
+        """
+        Removes reference files and half-written checkpoints (`<weights>.<pid>.tmp`) whose
+        process no longer runs (killed, crashed, power loss).
+        """
+        tmp_prefix = os.path.basename(self.weights_path) + "."
+        for name in os.listdir(self.cache_dir):
+            if not (name.startswith(tmp_prefix) and name.endswith(".tmp")):
+                continue
+            try:
+                pid = int(name[len(tmp_prefix):-len(".tmp")])
+            except ValueError:
+                continue
+            if not _pid_alive(pid):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass
+
+        if not os.path.isdir(self.refs_dir):
+            return
+        for name in os.listdir(self.refs_dir):
+            try:
+                pid = int(name.split("-")[0])
+            except ValueError:
+                continue
+            if not _pid_alive(pid):
+                try:
+                    os.remove(os.path.join(self.refs_dir, name))
+                except FileNotFoundError:
+                    pass
+
+    def _publish(self):
+        print(f"Publishing shared Whisper weights ({self.model_size})...")
+        model = whisper.load_model(self.model_size, device="cpu")
+        checkpoint = {
+            "dims": model.dims.__dict__,
+            "model_state_dict": model.state_dict(),
+        }
+        # Write to a temp name first so no process ever maps a half-written file
+        tmp_path = f"{self.weights_path}.{os.getpid()}.tmp"
+        try:
+            torch.save(checkpoint, tmp_path)
+            os.replace(tmp_path, self.weights_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        finally:
+            del model, checkpoint
+
+    def _map_model(self):
+        checkpoint = torch.load(self.weights_path, map_location="cpu", mmap=True, weights_only=True)
+        dims = ModelDimensions(**checkpoint["dims"])
+
+        # Build the module on the meta device so no private weight copy is allocated,
+        # then point its parameters straight at the mapped tensors.
+        with torch.device("meta"):
+            model = Whisper(dims)
+        model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+
+        # Non-persistent buffers are not in the checkpoint and are still meta tensors,
+        # so rebuild them on the CPU exactly as Whisper's constructors do.
+        mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-np.inf).triu_(1)
+        model.decoder.register_buffer("mask", mask, persistent=False)
+
+        all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+        all_heads[dims.n_text_layer // 2:] = True
+        model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+        if self.model_size in whisper._ALIGNMENT_HEADS:
+            model.set_alignment_heads(whisper._ALIGNMENT_HEADS[self.model_size])
+
+        leftover = [name for name, t in list(model.named_parameters()) + list(model.named_buffers()) if t.is_meta]
+        if leftover:
+            raise RuntimeError(f"Shared Whisper model has uninitialised tensors: {', '.join(leftover)}")
+
+        model.eval()
+        return model
+
+    def _lock(self):
+        return _FileLock(self.lock_path)
+
+
+def _pid_alive(pid):
+    """True if a process with this pid is running."""
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill(pid, 0) would terminate the process on Windows, so ask the kernel instead
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(code))) and code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+class _FileLock:
+    """
+    Minimal cross-process lock based on exclusive file creation (works on Windows too).
+    The lock file holds "<pid>:<token>"; it is only broken when that pid is gone, so a
+    holder busy downloading a model for a long time keeps its lock.
+    """
+
+    EMPTY_GRACE = 5.0  # seconds an unreadable lock file is tolerated (holder still writing it)
+
+    def __init__(self, path):
+        self.path = path
+        self.token = f"{os.getpid()}:{id(self)}"
+
+    def __enter__(self):
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, self.token.encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                if self._holder_is_dead():
+                    try:
+                        os.remove(self.path)
+                    except OSError:
+                        pass
+                    continue
+                time.sleep(0.1)
+
+    def __exit__(self, exc_type, exc, tb):
+        # Only remove the lock if it is still ours
+        if self._read() == self.token:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _holder_is_dead(self):
+        content = self._read()
+        if content is None:
+            return False  # removed meanwhile; just retry
+        try:
+            pid = int(content.split(":")[0])
+        except ValueError:
+            try:
+                return time.time() - os.path.getmtime(self.path) > self.EMPTY_GRACE
+            except OSError:
+                return False
+        return not _pid_alive(pid)
@@ -0,0 +1,66 @@
+import os
+
+from learner_store import LearnerStore
+from scheduler import SessionScheduler
+
+
+def count(store, table):
+    return store.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_attempts_are_batched_until_flush(tmp_path):
+    store = LearnerStore(os.path.join(tmp_path, "learner.db"), batch_size=3)
+    store.add_attempt("cat", "A1", 5, "cat")
+    store.add_attempt("cat", "A1", 6, "cat")
+    assert count(store, "attempts") == 0
+
+    store.add_attempt("dog", "A1", 7, "dog")
+    assert count(store, "attempts") == 3
+
+    store.add_attempt("egg", "A1", 2, "leg")
+    store.flush()
+    assert count(store, "attempts") == 4
+    store.close()
+
+
+def test_word_stats_and_settings_survive_reopen(tmp_path):
+    path = os.path.join(tmp_path, "learner.db")
+    words = {"A1": ["cat", "dog", "egg"]}
+    now = 1_000_000.0
+
+    scheduler = SessionScheduler(words)
+    store = LearnerStore(path)
+    store.save_word_stats(scheduler.review("cat", "A1", 9, now=now))
+    store.save_word_stats(scheduler.review("dog", "A1", 3, now=now))
+    store.raise_setting("unlocked_level_index", 2)
+    store.close()
+
+    store = LearnerStore(path)
+    saved = store.load_word_stats()
+    assert saved == {w: scheduler.stats[w] for w in ("cat", "dog")}
+    assert int(store.get_setting("unlocked_level_index")) == 2
+
+    restored = SessionScheduler(words, saved)
+    assert restored._key(restored.stats["dog"]) == scheduler._key(scheduler.stats["dog"])
+    store.close()
+
+
+def test_shared_store_does_not_roll_back_progress(tmp_path):
+    path = os.path.join(tmp_path, "learner.db")
+    newer, older = LearnerStore(path), LearnerStore(path)
+
+    newer.raise_setting("unlocked_level_index", 3)
+    older.raise_setting("unlocked_level_index", 1)
+    assert int(newer.get_setting("unlocked_level_index")) == 3
+
+    scheduler = SessionScheduler({"A1": ["cat"]})
+    stale = scheduler.review("cat", "A1", 3, now=1_000.0)
+    fresh = scheduler.review("cat", "A1", 9, now=2_000.0)
+    newer.save_word_stats(fresh)
+    newer.flush()
+    older.save_word_stats(stale)
+    older.flush()
+    assert newer.load_word_stats()["cat"]["last_score"] == 9
+
+    newer.close()
+    older.close()
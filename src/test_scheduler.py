@@ -0,0 +1,81 @@
+from scheduler import SessionScheduler
+
+
+DAY = 24 * 3600
+
+
+def make_words(n, prefix="w"):
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def test_weak_words_do_not_starve_new_ones():
+    scheduler = SessionScheduler({"A1": make_words(100)})
+    now = 1_000_000.0
+
+    first = scheduler.next_session("A1", 10, now=now)
+    for word in first:
+        scheduler.review(word, "A1", 6, now=now)
+
+    seen = set(first)
+    for day in range(1, 6):
+        session = scheduler.next_session("A1", 10, now=now + day * DAY)
+        new_words = [w for w in session if w not in seen]
+        assert len(new_words) >= 3
+        for word in session:
+            scheduler.review(word, "A1", 6, now=now + day * DAY)
+        seen.update(session)
+
+
+def test_failed_word_comes_back_after_retry_interval():
+    scheduler = SessionScheduler({"A1": ["cat"]})
+    now = 1_000_000.0
+    scheduler.review("cat", "A1", 2, now=now)
+
+    key = scheduler._key(scheduler.stats["cat"])
+    assert key == now + SessionScheduler.RETRY_INTERVAL
+
+
+def test_session_has_k_distinct_words():
+    # Duplicate headwords in the word list must not produce duplicates in a session
+    scheduler = SessionScheduler({"A1": make_words(50) + make_words(5)})
+    session = scheduler.next_session("A1", 10, now=1_000_000.0)
+    assert len(session) == 10
+    assert len(set(session)) == 10
+
+
+def test_session_falls_back_to_all_words_when_level_is_small():
+    scheduler = SessionScheduler({"A1": make_words(4)})
+    assert sorted(scheduler.next_session("A1", 10, now=1_000_000.0)) == sorted(make_words(4))
+
+
+def test_overdue_words_come_before_new_ones():
+    scheduler = SessionScheduler({"A1": make_words(100)})
+    now = 1_000_000.0
+    reviewed = make_words(20)
+    for word in reviewed:
+        scheduler.review(word, "A1", 3, now=now)
+
+    session = scheduler.next_session("A1", 10, now=now + DAY)
+    overdue = [w for w in session if w in reviewed]
+    # Everything but the slots kept for new words goes to overdue ones
+    assert len(overdue) == 10 - 3
+
+
+def test_word_at_several_levels_stays_scheduled_in_all():
+    scheduler = SessionScheduler({"A1": ["above", "cat"], "B1": ["above", "dog"]})
+    now = 1_000_000.0
+    scheduler.review("above", "A1", 3, now=now)
+
+    assert "above" in scheduler.next_session("A1", 10, now=now + DAY)
+    assert "above" in scheduler.next_session("B1", 10, now=now + DAY)
+
+
+def test_stale_heap_entries_are_rebuilt_away():
+    scheduler = SessionScheduler({"A1": make_words(10)})
+    now = 1_000_000.0
+    for i in range(1000):
+        scheduler.review(f"w{i % 10}", "A1", i % 10, now=now + i)
+
+    heap = scheduler._due["A1"]
+    assert len(heap) <= 2 * len(scheduler.stats) + 64
+    assert sorted(scheduler.next_session("A1", 10, now=now + 10 * DAY)) == sorted(make_words(10))